@@ -1,40 +1,34 @@
-import base64
-from github_fetcher import GitHubFetcher
+import heapq
+from github_fetcher import GitHubFetcher, RateLimitError
 from signals import SignalDetector
 from tier_profiler import TierProfile
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional
 
 class RepositoryAnalyzer:
     def __init__(self, repo_url: str):
         self.repo_url = repo_url
-        self.fetcher = GitHubFetcher(repo_url)
+        self.fetcher = None  # Fresh GitHubFetcher per analyze() call
     
-    def analyze(self) -> Dict[str, Any]:
-        """Main analysis pipeline - FULLY FIXED"""
+    def analyze(self, dimensions: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Main analysis pipeline - FULLY FIXED
+        
+        Pass dimensions (e.g. ["commits"]) to compute only those signals; only the
+        data they need is fetched and tier matching is skipped.
+        """
+        self.fetcher = GitHubFetcher(self.repo_url)
         try:
-            # Fetch all data
-            print("📦 Fetching repository data...")
-            repo_info = self.fetcher.get_repo_info()
-            file_tree = self.fetcher.get_file_tree()
-            readme_content = self.fetcher.get_readme()
-            commits = self.fetcher.get_commits()
-            branches = self.fetcher.get_branches()
-            languages = self.fetcher.get_languages()
+            if dimensions is not None:
+                return self._analyze_partial(list(dimensions))
             
-            # Decode README if base64 encoded
-            readme = ""
-            if readme_content:
-                try:
-                    if isinstance(readme_content, str) and len(readme_content) > 100:
-                        readme = base64.b64decode(readme_content).decode('utf-8')
-                    else:
-                        readme = readme_content
-                except:
-                    readme = str(readme_content)[:2000]  # Fallback
+            # Start all fetches in parallel; detector pulls data lazily as needed
+            print("📦 Fetching repository data...")
+            self.fetcher.prefetch(GitHubFetcher.RESOURCES)
+            repo_info = self.fetcher.repo_info  # Required, fails fast for missing repos
             
             # Detect signals
             print("🔍 Analyzing signals...")
-            detector = SignalDetector(file_tree, readme, commits, branches, languages)
+            detector = SignalDetector(self.fetcher)
             signals = detector.get_all_signals()
             
             # Compute profile vector (pure integers)
@@ -46,10 +40,8 @@ class RepositoryAnalyzer:
             score = sum(profile_vector.values())
             
             # FIXED: Safe summary generation
-            strengths = sorted([(k, v) for k, v in profile_vector.items()], 
-                             key=lambda x: x[1], reverse=True)[:2]
-            weaknesses = sorted([(k, v) for k, v in profile_vector.items()], 
-                              key=lambda x: x[1])[:2]
+            strengths = heapq.nlargest(2, profile_vector.items(), key=lambda x: x[1])
+            weaknesses = heapq.nsmallest(2, profile_vector.items(), key=lambda x: x[1])
             
             # Safe display names mapping
             display_names = {
@@ -72,7 +64,7 @@ class RepositoryAnalyzer:
             roadmap = self._generate_roadmap(gaps, profile_vector)
             
             return {
-                "score": min(100, max(0, score)),  # Clamp 0-100
+                "score": 0 if score < 0 else (100 if score > 100 else score),  # Clamp 0-100
                 "tier": tier.title(),
                 "tier_similarity": round(similarity * 100, 1),
                 "profile": profile_vector,
@@ -81,18 +73,44 @@ class RepositoryAnalyzer:
                 "summary": summary,
                 "roadmap": roadmap,
                 "repo_info": repo_info,
-                "commit_count": len(commits),
-                "branch_count": len(branches),
-                "languages": languages,
+                "commit_count": len(self.fetcher.commits),
+                "branch_count": self.fetcher.branch_count,
+                "languages": self.fetcher.languages,
                 "status": "success"
             }
         
+        except RateLimitError as e:
+            print(f"Rate limited: {e}")
+            return {
+                "error": "GitHub API rate limit exceeded, try again later",
+                "reset_at": e.reset_at,
+                "status": "rate_limited"
+            }
+        
         except Exception as e:
             print(f"Analysis error: {e}")
             return {
                 "error": f"Analysis failed: {str(e)}",
                 "status": "error"
             }
+        
+        finally:
+            self.fetcher.close()
+    
+    def _analyze_partial(self, dimensions: List[str]) -> Dict[str, Any]:
+        """Score only the requested dimensions, fetching just the data they need"""
+        self.fetcher.prefetch(["repo_info"] + SignalDetector.required_resources(dimensions))
+        self.fetcher.repo_info  # Existence check, fails fast for missing/private repos
+        
+        signals = SignalDetector(self.fetcher).get_all_signals(dimensions)
+        profile = {k: v[0] for k, v in signals.items()}
+        
+        return {
+            "score": sum(profile.values()),
+            "profile": profile,
+            "signals": {k: v[1] for k, v in signals.items()},
+            "status": "success"
+        }
     
     def _generate_roadmap(self, gaps: Dict[str, int], profile: Dict[str, int]) -> list:
         """Generate actionable, personalized roadmap items"""
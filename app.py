@@ -1,9 +1,40 @@
 from flask import Flask, render_template, request, jsonify
 from analyzer import RepositoryAnalyzer
-import json
+from collections import OrderedDict
+import orjson
+import os
+import threading
+import time
 
 app = Flask(__name__)
 
+# In-process LRU + TTL cache of analysis results keyed by repo URL
+RESULT_CACHE_MAXSIZE = 256
+RESULT_CACHE_TTL = 300  # seconds
+_result_cache = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+def _analyze_cached(repo_url: str, refresh: bool = False) -> dict:
+    """Return a cached analysis if still fresh, otherwise run the full pipeline"""
+    now = time.monotonic()
+    if not refresh:
+        with _result_cache_lock:
+            entry = _result_cache.get(repo_url)
+            if entry and now - entry[0] < RESULT_CACHE_TTL:
+                _result_cache.move_to_end(repo_url)
+                return entry[1]
+    
+    result = RepositoryAnalyzer(repo_url).analyze()
+    
+    # Only cache successful analyses so transient errors are retried
+    if result.get("status") == "success":
+        with _result_cache_lock:
+            _result_cache[repo_url] = (now, result)
+            _result_cache.move_to_end(repo_url)
+            while len(_result_cache) > RESULT_CACHE_MAXSIZE:
+                _result_cache.popitem(last=False)
+    return result
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -16,12 +47,19 @@ def analyze():
     if not repo_url:
         return jsonify({"error": "Please provide a repository URL"}), 400
     
+    refresh = request.args.get('refresh') == '1'
+    
     try:
-        analyzer = RepositoryAnalyzer(repo_url)
-        result = analyzer.analyze()
-        return jsonify(result)
+        result = _analyze_cached(repo_url, refresh=refresh)
+        response = app.response_class(orjson.dumps(result), mimetype="application/json")
+        if result.get("status") == "rate_limited":
+            response.status_code = 429
+            response.headers["X-RateLimit-Reset"] = str(result["reset_at"])
+            response.headers["Retry-After"] = str(max(0, result["reset_at"] - int(time.time())))
+        return response
     except Exception as e:
         return jsonify({"error": f"Analysis failed: {str(e)}"}), 500
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    # Local development only; use wsgi.py (waitress) in production
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1', port=5000, threaded=True)
@@ -1,32 +1,287 @@
 import requests
 import os
+import base64
+import re
+import orjson
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 
 load_dotenv()
 
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GITHUB_API_BASE = "https://api.github.com"
+ETAG_CACHE_PATH = os.getenv(
+    "GITGRADE_ETAG_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".gitgrade_etag_cache.sqlite"),
+)
+ETAG_CACHE_MAX_BYTES = 64 * 1024 * 1024  # total stored body size
+ETAG_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds since last stored
+RAW_FILE_MAX_BYTES = 256 * 1024
+
+# Last page number in a paginated response's Link header
+_LAST_PAGE_RE = re.compile(r'[?&]page=(\d+)>; rel="last"')
 
 headers = {
     "Authorization": f"token {GITHUB_TOKEN}",
     "Accept": "application/vnd.github.v3+json"
 }
 
+class RateLimitError(Exception):
+    """GitHub API quota is (nearly) exhausted until reset_at (unix time)"""
+    
+    def __init__(self, reset_at: int):
+        self.reset_at = reset_at
+        super().__init__(f"GitHub API rate limit exhausted, resets at {reset_at}")
+
+class ETagCache:
+    """
+    On-disk {url: (etag, json_body)} store for GitHub conditional GETs.
+    
+    Best-effort: SQLite errors (unwritable path, locked or full database) are logged
+    once and treated as cache misses, so fetches fall back to plain GETs.
+    
+    Opened on first use; reads never write. Entries stored more than max_age seconds
+    ago are dropped, and the oldest are evicted once bodies exceed max_bytes in total.
+    """
+    
+    def __init__(self, path: str, max_bytes: int = ETAG_CACHE_MAX_BYTES,
+                 max_age: int = ETAG_CACHE_MAX_AGE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._warned = False
+    
+    def _warn(self, error: sqlite3.Error) -> None:
+        """Log the first cache failure only (call with the lock held)"""
+        if not self._warned:
+            self._warned = True
+            print(f"⚠️ ETag cache unavailable ({self.path}): {error}")
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database lazily (call with the lock held)"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS etag_entries "
+                    "(url TEXT PRIMARY KEY, etag TEXT, body BLOB, size INTEGER, stored_at REAL)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS etag_entries_stored_at ON etag_entries (stored_at)"
+                )
+            self._conn = conn
+        return self._conn
+    
+    def get(self, url: str) -> Optional[Tuple[str, Any]]:
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT etag, body FROM etag_entries WHERE url = ?", (url,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                self._warn(e)
+                return None
+        if row is None:
+            return None
+        return row[0], orjson.loads(row[1])
+    
+    def set(self, url: str, etag: str, body: Any) -> None:
+        now = time.time()
+        blob = orjson.dumps(body)
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO etag_entries (url, etag, body, size, stored_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (url, etag, blob, len(blob), now),
+                    )
+                    # Evict stale entries, then the oldest once total size exceeds the cap
+                    conn.execute(
+                        "DELETE FROM etag_entries WHERE stored_at < ?", (now - self.max_age,)
+                    )
+                    conn.execute(
+                        "DELETE FROM etag_entries WHERE url IN (SELECT url FROM "
+                        "(SELECT url, SUM(size) OVER (ORDER BY stored_at DESC, url) AS total "
+                        "FROM etag_entries) WHERE total > ?)",
+                        (self.max_bytes,),
+                    )
+            except sqlite3.Error as e:
+                self._warn(e)
+
+etag_cache = ETagCache(ETAG_CACHE_PATH)
+
 class GitHubFetcher:
+    # Last seen X-RateLimit-* values, shared by all fetchers (one token per process)
+    _rate_remaining: Optional[int] = None
+    _rate_reset = 0
+    _rate_lock = threading.Lock()
+    
+    # Lazily fetched resources: name -> (getter, fallback on failure; None = required)
+    RESOURCES = {
+        "repo_info": ("get_repo_info", None),
+        "file_tree": ("get_file_tree", []),
+        "readme": ("get_readme", {}),
+        "commits": ("get_commits", []),
+        "branch_count": ("get_branch_count", 0),
+        "languages": ("get_languages", {}),
+    }
+    
     def __init__(self, repo_url: str):
         """Extract owner and repo from URL like https://github.com/user/repo"""
         parts = repo_url.rstrip('/').split('/')
         self.owner = parts[-2]
         self.repo = parts[-1]
         self.repo_url = repo_url
+        self.session = self._build_session()
+        # Per-analysis pool, one worker per resource (threads are started on first submit)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.RESOURCES))
+        self._futures: Dict[str, Future] = {}
+        self._futures_lock = threading.Lock()
+        self._closed = False
+    
+    @staticmethod
+    def _build_session() -> requests.Session:
+        """Pooled keep-alive session so all calls share TCP/TLS connections"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+        )
+        session.mount("https://", adapter)
+        session.headers.update(headers)
+        return session
+    
+    def fetch(self, name: str) -> Future:
+        """Start fetching a resource in the background (once) and return its future"""
+        with self._futures_lock:
+            if self._closed:
+                raise RuntimeError("GitHubFetcher is closed; create a new one per analysis")
+            future = self._futures.get(name)
+            if future is None:
+                future = self._executor.submit(getattr(self, self.RESOURCES[name][0]))
+                self._futures[name] = future
+        return future
+    
+    def prefetch(self, names: Iterable[str]) -> None:
+        """Kick off several fetches so they run in parallel"""
+        for name in names:
+            self.fetch(name)
+    
+    def close(self) -> None:
+        """
+        Release the fetch threads and pooled connections (fetcher is single-use).
+        
+        Queued fetches are cancelled, but in-flight ones (e.g. after repo_info
+        failed) are waited for so they never run on a closed session.
+        """
+        with self._futures_lock:
+            self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self.session.close()
+    
+    def _resolve(self, name: str) -> Any:
+        """Wait for a resource; optional ones fall back to an empty default on failure"""
+        default = self.RESOURCES[name][1]
+        try:
+            return self.fetch(name).result()
+        except RateLimitError:
+            raise  # Never mask quota exhaustion with an empty default
+        except Exception as e:
+            if default is None:
+                raise
+            print(f"⚠️ Fetch '{name}' failed: {e}")
+            return default
+    
+    # Lazy, memoized repo data
+    @cached_property
+    def repo_info(self) -> Dict[str, Any]:
+        return self._resolve("repo_info")
+    
+    @cached_property
+    def file_tree(self) -> List[Dict[str, str]]:
+        return self._resolve("file_tree")
+    
+    @cached_property
+    def readme(self) -> str:
+        """Decoded README text; GitHub wraps base64 at 60 cols, so strip newlines first"""
+        payload = self._resolve("readme")
+        content = payload.get("content", "")
+        if payload.get("encoding") == "base64":
+            return base64.b64decode(content.replace("\n", "")).decode("utf-8", errors="replace")
+        return content
+    
+    @cached_property
+    def commits(self) -> List[Dict[str, Any]]:
+        return self._resolve("commits")
+    
+    @cached_property
+    def branch_count(self) -> int:
+        return self._resolve("branch_count")
+    
+    @cached_property
+    def languages(self) -> Dict[str, int]:
+        return self._resolve("languages")
+    
+    def _api_get(self, url: str, **kwargs) -> requests.Response:
+        """GET against the API, failing fast when the rate limit is exhausted"""
+        cls = GitHubFetcher
+        with cls._rate_lock:
+            if (cls._rate_remaining is not None and cls._rate_remaining < 2
+                    and time.time() < cls._rate_reset):
+                raise RateLimitError(reset_at=cls._rate_reset)
+        
+        response = self.session.get(url, timeout=10, **kwargs)
+        
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            with cls._rate_lock:
+                cls._rate_remaining = int(remaining)
+                cls._rate_reset = int(response.headers.get("X-RateLimit-Reset", 0))
+            if response.status_code in (403, 429) and int(remaining) == 0:
+                raise RateLimitError(reset_at=cls._rate_reset)
+        return response
+    
+    def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                  required: bool = True) -> Any:
+        """
+        Conditional GET: send the cached ETag and reuse the cached body on 304.
+        
+        Returns None for non-200 responses when required=False.
+        """
+        cache_key = requests.Request("GET", url, params=params).prepare().url
+        cached = etag_cache.get(cache_key)
+        extra_headers = {"If-None-Match": cached[0]} if cached else None
+        
+        response = self._api_get(url, params=params, headers=extra_headers)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        if not required and response.status_code != 200:
+            return None
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        etag = response.headers.get("ETag")
+        if etag:
+            etag_cache.set(cache_key, etag, data)
+        return data
         
     def get_repo_info(self) -> Dict[str, Any]:
         """Fetch basic repo metadata"""
         url = f"{GITHUB_API_BASE}/repos/{self.owner}/{self.repo}"
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = self._get_json(url)
         return {
             "name": data.get("name"),
             "description": data.get("description"),
@@ -40,32 +295,26 @@ class GitHubFetcher:
     def get_languages(self) -> Dict[str, int]:
         """Fetch language distribution"""
         url = f"{GITHUB_API_BASE}/repos/{self.owner}/{self.repo}/languages"
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return self._get_json(url)
     
     def get_file_tree(self) -> List[Dict[str, str]]:
         """Fetch repo file structure (simplified)"""
         url = f"{GITHUB_API_BASE}/repos/{self.owner}/{self.repo}/git/trees/HEAD?recursive=1"
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = self._get_json(url)
         return data.get("tree", [])
     
-    def get_readme(self) -> str:
-        """Fetch README content"""
+    def get_readme(self) -> Dict[str, str]:
+        """Fetch README payload: {"content": ..., "encoding": ...}"""
         url = f"{GITHUB_API_BASE}/repos/{self.owner}/{self.repo}/readme"
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            return response.json().get("content", "")
-        return ""
+        data = self._get_json(url, required=False)
+        if data:
+            return {"content": data.get("content", ""), "encoding": data.get("encoding", "")}
+        return {}
     
-    def get_commits(self, per_page: int = 100) -> List[Dict[str, Any]]:
+    def get_commits(self, per_page: int = 50) -> List[Dict[str, Any]]:
         """Fetch recent commits"""
         url = f"{GITHUB_API_BASE}/repos/{self.owner}/{self.repo}/commits"
-        response = requests.get(url, headers=headers, params={"per_page": per_page}, timeout=10)
-        response.raise_for_status()
-        commits = response.json()
+        commits = self._get_json(url, params={"per_page": per_page})
         return [
             {
                 "message": c.get("commit", {}).get("message", ""),
@@ -76,17 +325,28 @@ class GitHubFetcher:
             for c in commits
         ]
     
-    def get_branches(self) -> List[str]:
-        """Fetch list of branches"""
+    def get_branch_count(self) -> int:
+        """Count branches with a 1-per-page request and the Link header's last page"""
         url = f"{GITHUB_API_BASE}/repos/{self.owner}/{self.repo}/branches"
-        response = requests.get(url, headers=headers, timeout=10)
+        response = self._api_get(url, params={"per_page": 1})
         response.raise_for_status()
-        return [b.get("name") for b in response.json()]
+        match = _LAST_PAGE_RE.search(response.headers.get("Link", ""))
+        if match:
+            return int(match.group(1))
+        return len(orjson.loads(response.content))
 
-    def get_raw_file_content(self, file_path: str) -> str:
-        """Fetch raw content of a specific file"""
+    def get_raw_file_content(self, file_path: str, max_bytes: int = RAW_FILE_MAX_BYTES) -> str:
+        """Fetch raw content of a specific file, streamed and truncated at max_bytes"""
         url = f"https://raw.githubusercontent.com/{self.owner}/{self.repo}/HEAD/{file_path}"
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            return response.text
-        return ""
+        # Raw host is not the API: drop the session's token/Accept headers as before
+        raw_headers = {"Authorization": None, "Accept": None}
+        with self.session.get(url, headers=raw_headers, stream=True, timeout=10) as response:
+            if response.status_code != 200:
+                return ""
+            buf = bytearray()
+            for chunk in response.iter_content(chunk_size=8192, decode_unicode=False):
+                buf += chunk
+                if len(buf) >= max_bytes:
+                    del buf[max_bytes:]
+                    break  # Abort the rest of the download
+        return bytes(buf).decode("utf-8", errors="replace")
@@ -1,27 +1,121 @@
-import os
-from typing import Dict, List, Tuple
-from collections import defaultdict
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from github_fetcher import GitHubFetcher
+
+# Folder-name keyword sets for signal_structure (O(1) membership)
+_GOOD_FOLDERS = frozenset({"src", "tests", "test", "docs", "config", "models", "controllers",
+                           "services", "api", "database", "auth", "ui", "components", "views"})
+_BAD_FOLDERS = frozenset({"utils", "helpers", "misc", "constants", "functions", "lib", "tools"})
+
+# Path substrings for signal_dependencies
+_DEP_FILES = ("requirements.txt", "package.json", "Gemfile", "pom.xml", "go.mod")
+_LOCK_FILES = ("package-lock.json", "yarn.lock", "Pipfile.lock", "poetry.lock")
+
+# Commit message classification for signal_commits
+_CONVENTIONAL_PREFIXES = ("feat:", "fix:", "docs:", "style:", "test:", "refactor:", "chore:")
+_QUALITY_KEYWORDS = ("add", "fix", "refactor", "improve", "update", "implement", "feature")
+_COMMIT_SAMPLE = 50
+
+# README sections (signs of mature documentation) -> one compiled alternation each
+_README_SECTIONS = {
+    "overview": ["overview", "about", "description", "what is"],
+    "setup": ["setup", "installation", "install", "getting started"],
+    "usage": ["usage", "how to use", "tutorial", "examples"],
+    "architecture": ["architecture", "design", "structure"],
+    "contributing": ["contributing", "contribution", "contribute"],
+}
+_SECTION_PATTERNS = {
+    section: re.compile("|".join(re.escape(kw) for kw in keywords), re.IGNORECASE)
+    for section, keywords in _README_SECTIONS.items()
+}
 
 class SignalDetector:
     """Extract 5 key maturity signals from repo data"""
     
-    def __init__(self, file_tree: List[Dict], readme: str, commits: List[Dict], 
-                 branches: List[str], languages: Dict):
-        self.file_tree = file_tree
-        self.readme = readme
-        self.commits = commits
-        self.branches = branches
-        self.languages = languages
-        self.folder_names = self._extract_folders()
+    # Fetcher resources each signal depends on (only these are pulled)
+    SIGNAL_RESOURCES = {
+        "structure": ("file_tree",),
+        "documentation": ("readme",),
+        "tests": ("file_tree",),
+        "commits": ("commits",),
+        "dependencies": ("file_tree",),
+    }
+    
+    def __init__(self, fetcher: GitHubFetcher):
+        self.fetcher = fetcher
+        self._paths_scanned = False
+    
+    # Repo data, fetched lazily on first use
+    @property
+    def file_tree(self) -> List[Dict]:
+        return self.fetcher.file_tree
     
-    def _extract_folders(self) -> List[str]:
-        """Extract top-level folders from file tree"""
+    @property
+    def readme(self) -> str:
+        return self.fetcher.readme
+    
+    @property
+    def commits(self) -> List[Dict]:
+        return self.fetcher.commits
+    
+    @property
+    def languages(self) -> Dict:
+        return self.fetcher.languages
+    
+    @classmethod
+    def required_resources(cls, dimensions: Iterable[str]) -> List[str]:
+        """Fetcher resources needed to compute the given signals"""
+        resources = []
+        for dimension in dimensions:
+            if dimension not in cls.SIGNAL_RESOURCES:
+                raise ValueError(f"Unknown dimension: {dimension}")
+            for resource in cls.SIGNAL_RESOURCES[dimension]:
+                if resource not in resources:
+                    resources.append(resource)
+        return resources
+    
+    def _scan_paths(self) -> None:
+        """Walk the file tree once (on first use), collecting everything the path-based signals need"""
+        if self._paths_scanned:
+            return
+        
         folders = set()
+        self.test_count = 0
+        self.unit_test_count = 0
+        self.integration_test_count = 0
+        self.has_coverage_cfg = False
+        self.has_test_cfg = False
+        self.dep_files = []
+        self.lock_files = []
+        
         for item in self.file_tree:
-            path = item.get("path", "").split("/")
-            if len(path) > 1:
-                folders.add(path[0])
-        return list(folders)
+            path = item.get("path", "")
+            path_lower = path.lower()
+            
+            # Top-level folders
+            if "/" in path:
+                folders.add(path.split("/", 1)[0])
+            
+            # Tests
+            if "test" in path_lower:
+                self.test_count += 1
+                if "unit" in path_lower or "_test" in path:
+                    self.unit_test_count += 1
+                if "integration" in path_lower or "e2e" in path_lower:
+                    self.integration_test_count += 1
+            if "coverage" in path_lower or ".coveragerc" in path:
+                self.has_coverage_cfg = True
+            if "pytest.ini" in path or "jest.config" in path or "vitest" in path:
+                self.has_test_cfg = True
+            
+            # Dependencies
+            if any(df in path for df in _DEP_FILES):
+                self.dep_files.append(path)
+            if any(lf in path for lf in _LOCK_FILES):
+                self.lock_files.append(path)
+        
+        self.folder_names = list(folders)
+        self._paths_scanned = True
     
     # SIGNAL 1: Semantic Folder Structure (0-20)
     def signal_structure(self) -> Tuple[int, str]:
@@ -31,14 +125,11 @@ class SignalDetector:
         Good patterns: src/, tests/, docs/, config/, models/, controllers/, services/
         Bad patterns: utils/, helpers/, misc/, constants/, functions/
         """
-        semantic_keywords = {
-            "good": ["src", "tests", "test", "docs", "config", "models", "controllers", 
-                     "services", "api", "database", "auth", "ui", "components", "views"],
-            "bad": ["utils", "helpers", "misc", "constants", "functions", "lib", "tools"]
-        }
+        self._scan_paths()
         
-        good_count = sum(1 for f in self.folder_names if f.lower() in semantic_keywords["good"])
-        bad_count = sum(1 for f in self.folder_names if f.lower() in semantic_keywords["bad"])
+        folders_lower = [f.lower() for f in self.folder_names]
+        good_count = sum(1 for f in folders_lower if f in _GOOD_FOLDERS)
+        bad_count = sum(1 for f in folders_lower if f in _BAD_FOLDERS)
         
         total_folders = len(self.folder_names)
         
@@ -67,25 +158,17 @@ class SignalDetector:
         if not self.readme:
             return 0, "No README found"
         
-        readme_lower = self.readme.lower()
-        
-        # Check for key sections (signs of mature documentation)
-        sections = {
-            "overview": ["overview", "about", "description", "what is"],
-            "setup": ["setup", "installation", "install", "getting started"],
-            "usage": ["usage", "how to use", "tutorial", "examples"],
-            "architecture": ["architecture", "design", "structure"],
-            "contributing": ["contributing", "contribution", "contribute"],
-        }
-        
-        found_sections = sum(1 for section, keywords in sections.items() 
-                            if any(kw in readme_lower for kw in keywords))
+        # Check for key sections (one regex scan per section)
+        found_sections = sum(1 for pattern in _SECTION_PATTERNS.values()
+                            if pattern.search(self.readme))
         
         # Bonus for examples, images, badges
-        has_examples = "```"
+        has_examples = "```" in self.readme
         has_structure = len(self.readme) > 500  # Substantive content
         
-        score = min(20, (found_sections * 3) + (3 if has_examples else 0) + (2 if has_structure else 0))
+        score = (found_sections * 3) + (3 if has_examples else 0) + (2 if has_structure else 0)
+        if score > 20:
+            score = 20
         reason = f"Found {found_sections}/5 key sections, {'has examples' if has_examples else 'no examples'}"
         
         return score, reason
@@ -97,25 +180,16 @@ class SignalDetector:
         
         Looks for: unit tests, integration tests, E2E tests, test coverage config
         """
-        test_files = [item.get("path", "") for item in self.file_tree 
-                     if "test" in item.get("path", "").lower()]
-        
-        test_indicators = {
-            "unit": sum(1 for f in test_files if "unit" in f.lower() or "_test" in f),
-            "integration": sum(1 for f in test_files if "integration" in f.lower() or "e2e" in f.lower()),
-            "coverage": any("coverage" in f.lower() or ".coveragerc" in f for f in [item.get("path", "") for item in self.file_tree]),
-            "config": any("pytest.ini" in f or "jest.config" in f or "vitest" in f for f in [item.get("path", "") for item in self.file_tree]),
-        }
-        
-        test_count = len(test_files)
+        self._scan_paths()
+        test_count = self.test_count
         
         if test_count == 0:
             score = 0
             reason = "No tests found"
-        elif test_indicators["coverage"] or test_indicators["config"]:
+        elif self.has_coverage_cfg or self.has_test_cfg:
             score = 18
             reason = f"{test_count} test files with coverage config"
-        elif test_indicators["unit"] > 0 and test_indicators["integration"] > 0:
+        elif self.unit_test_count > 0 and self.integration_test_count > 0:
             score = 15
             reason = f"Unit + Integration tests ({test_count} files)"
         elif test_count > 5:
@@ -141,19 +215,20 @@ class SignalDetector:
         # Analyze messages
         conventional_count = 0
         descriptive_count = 0
-        quality_keywords = ["add", "fix", "refactor", "improve", "update", "implement", "feature"]
+        sample = self.commits[:_COMMIT_SAMPLE]  # Check last 50
+        max_score_hits = len(self.commits)
         
-        for commit in self.commits[:50]:  # Check last 50
-            msg = commit.get("message", "").lower()
-            if any(msg.startswith(c) for c in ["feat:", "fix:", "docs:", "style:", "test:", "refactor:", "chore:"]):
+        for commit in sample:
+            msg_lower = commit.get("message", "").lower()
+            if msg_lower.startswith(_CONVENTIONAL_PREFIXES):
                 conventional_count += 1
-            if len(msg.split()) > 3 and any(kw in msg for kw in quality_keywords):
+            if len(msg_lower.split()) > 3 and any(kw in msg_lower for kw in _QUALITY_KEYWORDS):
                 descriptive_count += 1
         
-        quality_ratio = (conventional_count + descriptive_count) / max(len(self.commits), 1)
-        
-        score = min(20, int(quality_ratio * 20))
-        reason = f"Conventional: {conventional_count}, Descriptive: {descriptive_count}/{len(self.commits[:50])}"
+        # Quality ratio scaled to 0-20 (integer math, capped)
+        hits = conventional_count + descriptive_count
+        score = 20 if hits >= max_score_hits else hits * 20 // max_score_hits
+        reason = f"Conventional: {conventional_count}, Descriptive: {descriptive_count}/{len(sample)}"
         
         return score, reason
     
@@ -165,13 +240,9 @@ class SignalDetector:
         Good: requirements.txt, package.json with pinned versions, lock files
         Bad: No dependency files, all wildcard versions
         """
-        dep_files = [item.get("path", "") for item in self.file_tree 
-                    if any(df in item.get("path", "") for df in 
-                           ["requirements.txt", "package.json", "Gemfile", "pom.xml", "go.mod"])]
-        
-        lock_files = [item.get("path", "") for item in self.file_tree 
-                     if any(lf in item.get("path", "") for lf in 
-                            ["package-lock.json", "yarn.lock", "Pipfile.lock", "poetry.lock"])]
+        self._scan_paths()
+        dep_files = self.dep_files
+        lock_files = self.lock_files
         
         if not dep_files:
             score = 0
@@ -188,12 +259,11 @@ class SignalDetector:
         
         return score, reason
     
-    def get_all_signals(self) -> Dict[str, Tuple[int, str]]:
-        """Return all 5 signals"""
+    def get_all_signals(self, dimensions: Optional[Iterable[str]] = None) -> Dict[str, Tuple[int, str]]:
+        """Return all 5 signals, or only the requested dimensions"""
+        if dimensions is None:
+            dimensions = self.SIGNAL_RESOURCES.keys()
         return {
-            "structure": self.signal_structure(),
-            "documentation": self.signal_documentation(),
-            "tests": self.signal_tests(),
-            "commits": self.signal_commits(),
-            "dependencies": self.signal_dependencies(),
+            dimension: getattr(self, f"signal_{dimension}")()
+            for dimension in dimensions
         }
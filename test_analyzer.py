@@ -0,0 +1,30 @@
+import requests
+from analyzer import RepositoryAnalyzer
+from github_fetcher import GitHubFetcher
+
+
+def test_partial_analysis_fails_for_missing_repo(monkeypatch):
+    """A 404 repo must not produce a "successful" all-zero partial analysis"""
+    def not_found(self):
+        raise requests.HTTPError("404 Client Error: Not Found")
+    
+    monkeypatch.setattr(GitHubFetcher, "get_repo_info", not_found)
+    monkeypatch.setattr(GitHubFetcher, "get_commits", not_found)
+    monkeypatch.setattr(GitHubFetcher, "get_file_tree", not_found)
+    
+    result = RepositoryAnalyzer("https://github.com/octocat/missing").analyze(["commits", "structure"])
+    
+    assert result["status"] == "error"
+    assert "404" in result["error"]
+
+
+def test_analyzer_can_be_reused_after_partial_run(monkeypatch):
+    """Each analyze() call gets its own fetcher, so a second call still works"""
+    monkeypatch.setattr(GitHubFetcher, "get_repo_info", lambda self: {"name": "Hello-World"})
+    monkeypatch.setattr(GitHubFetcher, "get_commits", lambda self: [])
+    
+    analyzer = RepositoryAnalyzer("https://github.com/octocat/Hello-World")
+    first = analyzer.analyze(["commits"])
+    second = analyzer.analyze(["commits"])
+    
+    assert first["status"] == second["status"] == "success"
@@ -0,0 +1,27 @@
+import orjson
+import github_fetcher
+from github_fetcher import ETagCache, GitHubFetcher
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = orjson.dumps(body)
+    
+    def raise_for_status(self):
+        pass
+
+
+def test_unwritable_etag_cache_falls_back_to_plain_fetch(monkeypatch, tmp_path):
+    """A broken cache must not fail fetches; it just behaves as a miss"""
+    cache = ETagCache(str(tmp_path / "missing-dir" / "cache.sqlite"))
+    monkeypatch.setattr(github_fetcher, "etag_cache", cache)
+    
+    fetcher = GitHubFetcher("https://github.com/octocat/Hello-World")
+    monkeypatch.setattr(fetcher, "_api_get",
+                        lambda url, **kwargs: FakeResponse({"Python": 100}, headers={"ETag": "\"e1\""}))
+    
+    assert fetcher.get_languages() == {"Python": 100}
+    assert cache.get("https://api.github.com/repos/octocat/Hello-World/languages") is None
+    fetcher.close()
@@ -28,6 +28,9 @@ class TierProfile:
         }
     }
     
+    # Fixed dimension order for vector math
+    TIER_KEYS = ("structure", "documentation", "tests", "commits", "dependencies")
+    
     @staticmethod
     def compute_profile_vector(signals: Dict[str, Tuple[int, str]]) -> Dict[str, int]:
         """FIXED: Extract ONLY numeric scores from signals (tuples -> ints)"""
@@ -53,11 +56,18 @@ class TierProfile:
     @staticmethod
     def match_tier(profile_vector: Dict[str, int]) -> Tuple[str, float]:
         """Find which tier the repo closest matches"""
+        vec = tuple(profile_vector[k] for k in TierProfile.TIER_KEYS)
+        mag = math.sqrt(sum(v * v for v in vec))
+        
         best_tier = None
         best_similarity = -1
         
-        for tier, tier_profile in TierProfile.TIER_PROFILES.items():
-            similarity = TierProfile.cosine_similarity(profile_vector, tier_profile)
+        for tier, tier_vec in _TIER_VECTORS.items():
+            tier_mag = _TIER_NORMS[tier]
+            if mag == 0 or tier_mag == 0:
+                similarity = 0
+            else:
+                similarity = sum(a * b for a, b in zip(vec, tier_vec)) / (mag * tier_mag)
             if similarity > best_similarity:
                 best_similarity = similarity
                 best_tier = tier
@@ -84,3 +94,13 @@ class TierProfile:
         
         return gaps
 
+
+# Tier vectors/magnitudes precomputed once at import for match_tier
+_TIER_VECTORS = {
+    tier: tuple(profile[k] for k in TierProfile.TIER_KEYS)
+    for tier, profile in TierProfile.TIER_PROFILES.items()
+}
+_TIER_NORMS = {
+    tier: math.sqrt(sum(v * v for v in vec))
+    for tier, vec in _TIER_VECTORS.items()
+}
@@ -0,0 +1,12 @@
+"""
+Production WSGI entrypoint.
+
+Run with a threaded server instead of Flask's dev server, e.g.:
+    waitress-serve --threads=32 --port=5000 wsgi:app
+"""
+import os
+from app import app
+
+if __name__ == '__main__':
+    from waitress import serve
+    serve(app, host='0.0.0.0', port=int(os.getenv('PORT', '5000')), threads=32)